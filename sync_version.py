@@ -48,22 +48,30 @@ def update_cargo_toml(version: str) -> None:
         print("Error: Cargo.toml not found", file=sys.stderr)
         sys.exit(1)
     
-    content = cargo_path.read_text()
+    content = cargo_path.read_bytes()
     
     # Remove .dev suffix for Cargo (it doesn't support dev versions)
     cargo_version = re.sub(r"\.dev\d+$", "", version)
     
-    # Update version line
-    new_content = re.sub(
-        r'^version = "[^"]*"',
-        f'version = "{cargo_version}"',
-        content,
-        count=1,
-        flags=re.MULTILINE
-    )
+    # Update version line: splice the bytes between the quotes of the first
+    # `version = "..."` line, falling back to a regex for unusual layouts
+    marker = b'\nversion = "'
+    index = content.find(marker)
+    end = content.find(b'"', index + len(marker)) if index != -1 else -1
+    if end != -1:
+        start = index + len(marker)
+        new_content = content[:start] + cargo_version.encode() + content[end:]
+    else:
+        new_content = re.sub(
+            rb'^version = "[^"]*"',
+            f'version = "{cargo_version}"'.encode(),
+            content,
+            count=1,
+            flags=re.MULTILINE
+        )
     
     if new_content != content:
-        cargo_path.write_text(new_content)
+        cargo_path.write_bytes(new_content)
         print(f"Updated Cargo.toml version to {cargo_version}")
     else:
         print(f"Cargo.toml already at version {cargo_version}")
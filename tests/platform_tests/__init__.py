@@ -10,6 +10,7 @@ Test Modules:
 - linux_distro_test.py: Linux distribution matrix testing (Ubuntu, RHEL, Alpine, etc.)
 - macos_integration_test.py: macOS integration testing (APFS, xattrs, etc.)
 - run_platform_tests.py: Master test coordinator and report generator
+- posix_probe.py: Tool probing shared by the Linux and macOS tests
 
 Usage:
     # Run all platform tests
@@ -31,5 +32,6 @@ __all__ = [
     "run_platform_tests",
     "windows_ecosystem_test", 
     "linux_distro_test",
-    "macos_integration_test"
+    "macos_integration_test",
+    "posix_probe"
 ]
\ No newline at end of file
@@ -13,14 +13,22 @@ Tests macOS-specific behaviors:
 - Versions: macOS 11 (Big Sur) through macOS 14 (Sonoma) compatibility
 """
 
+import ctypes
+import ctypes.util
+import functools
+import hashlib
+import json
 import os
 import sys
 import platform
+import plistlib
 import tempfile
 import subprocess
 import shutil
 import stat
 import time
+from concurrent.futures import ThreadPoolExecutor
+from errno import ERANGE
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import unittest
@@ -28,33 +36,419 @@ import unittest
 # Add project root to Python path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))  # for the shared posix_probe module
 
 # Only run on macOS
 if platform.system() != 'Darwin':
     raise unittest.SkipTest("macOS integration tests can only run on macOS")
 
 import vexy_glob
+from posix_probe import probe
+from benchmark_utils import write_file, write_files
+
+_RESOURCE_FORK_EXCLUDE = ["._*"]  # AppleDouble files holding resource forks
+
+# macOS marketing names by major version
+_MARKETING_NAMES = {'11': 'Big Sur', '12': 'Monterey', '13': 'Ventura', '14': 'Sonoma'}
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_macos_version() -> Dict[str, str]:
+    """Detect macOS version and name"""
+    version_info = {'version': 'Unknown', 'name': 'Unknown', 'build': 'Unknown'}
+    
+    # sw_vers just prints this plist, so read it in-process
+    try:
+        with open('/System/Library/CoreServices/SystemVersion.plist', 'rb') as f:
+            system_version = plistlib.load(f)
+        version_info['version'] = system_version.get('ProductVersion', 'Unknown')
+        version_info['name'] = system_version.get('ProductName', 'Unknown')
+        version_info['build'] = system_version.get('ProductBuildVersion', 'Unknown')
+    except (OSError, plistlib.InvalidFileException):
+        version_info['version'] = platform.mac_ver()[0] or 'Unknown'
+    
+    # Map version to marketing name
+    major = version_info['version'].split('.')[0]
+    version_info['marketing_name'] = _MARKETING_NAMES.get(major, 'Unknown')
+    
+    return version_info
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_filesystems() -> Dict[str, List[str]]:
+    """Detect available filesystems"""
+    available = []
+    
+    # Check mount points for filesystem types (the table mount(8) prints)
+    try:
+        for _, fs_type in _read_mounts():
+            if fs_type not in available:
+                available.append(fs_type)
+    except OSError:
+        try:
+            result = subprocess.run(['mount'], capture_output=True, text=True)
+            if result.returncode == 0:
+                for line in result.stdout.split('\n'):
+                    if ' on ' in line and ' (' in line:
+                        fs_info = line.split(' (')[1].split(',')[0]
+                        if fs_info not in available:
+                            available.append(fs_info)
+        except FileNotFoundError:
+            pass
+    
+    # Check for specific filesystem tools
+    fs_tools = {
+        'APFS': ['diskutil', 'apfs', 'list'],
+        'HFS+': ['diskutil', 'info', '/']
+    }
+    
+    # Only probe for filesystems the mount table has not already shown
+    mounted = {fs_type.lower() for fs_type in available}
+    for fs_name, mount_type in (('APFS', 'apfs'), ('HFS+', 'hfs')):
+        if mount_type in mounted:
+            fs_tools.pop(fs_name)
+            available.append(fs_name)
+    if not fs_tools:
+        return {'available': available}
+    
+    # The diskutil probes are independent, so wait on them concurrently
+    with ThreadPoolExecutor(max_workers=len(fs_tools)) as executor:
+        succeeded = list(executor.map(probe, fs_tools.values()))
+    
+    for fs_name, ok in zip(fs_tools, succeeded):
+        if ok and fs_name not in available:
+            available.append(fs_name)
+    
+    return {'available': available}
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_security_features() -> Dict[str, Any]:
+    """Detect macOS security features"""
+    security_info = {'sip_status': 'unknown', 'gatekeeper': 'unknown'}
+    
+    # Check SIP status
+    try:
+        result = subprocess.run(['csrutil', 'status'], capture_output=True, text=True)
+        if result.returncode == 0:
+            if 'disabled' in result.stdout.lower():
+                security_info['sip_status'] = 'disabled'
+            elif 'enabled' in result.stdout.lower():
+                security_info['sip_status'] = 'enabled'
+    except FileNotFoundError:
+        pass
+    
+    # Check Gatekeeper status
+    try:
+        result = subprocess.run(['spctl', '--status'], capture_output=True, text=True)
+        if result.returncode == 0:
+            security_info['gatekeeper'] = result.stdout.strip()
+    except FileNotFoundError:
+        pass
+    
+    return security_info
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_xcode() -> Dict[str, Any]:
+    """Detect Xcode installation"""
+    xcode_info = {'available': False, 'version': 'Unknown', 'command_line_tools': False}
+    
+    # Check for Xcode
+    try:
+        result = subprocess.run(['xcode-select', '--print-path'], 
+                              capture_output=True, text=True)
+        if result.returncode == 0:
+            xcode_info['available'] = True
+            xcode_path = result.stdout.strip()
+            
+            # Check if it's command line tools or full Xcode
+            if 'CommandLineTools' in xcode_path:
+                xcode_info['command_line_tools'] = True
+            else:
+                # Try to get Xcode version from Xcode.app/Contents/version.plist
+                # (the path ends in Contents/Developer); xcodebuild -version
+                # loads the whole toolchain, so only use it as a fallback
+                try:
+                    with open(Path(xcode_path).parent / 'version.plist', 'rb') as f:
+                        xcode_info['version'] = plistlib.load(f)['CFBundleShortVersionString']
+                except (OSError, KeyError, plistlib.InvalidFileException):
+                    try:
+                        result = subprocess.run(['xcodebuild', '-version'], 
+                                              capture_output=True, text=True)
+                        if result.returncode == 0:
+                            version_line = result.stdout.split('\n')[0]
+                            xcode_info['version'] = version_line.split(' ')[1]
+                    except FileNotFoundError:
+                        pass
+    except FileNotFoundError:
+        pass
+    
+    return xcode_info
+
+
+class _StatFS(ctypes.Structure):
+    """Darwin struct statfs, 64-bit inode layout (sys/mount.h)"""
+    _fields_ = [
+        ('f_bsize', ctypes.c_uint32),
+        ('f_iosize', ctypes.c_int32),
+        ('f_blocks', ctypes.c_uint64),
+        ('f_bfree', ctypes.c_uint64),
+        ('f_bavail', ctypes.c_uint64),
+        ('f_files', ctypes.c_uint64),
+        ('f_ffree', ctypes.c_uint64),
+        ('f_fsid', ctypes.c_int32 * 2),
+        ('f_owner', ctypes.c_uint32),
+        ('f_type', ctypes.c_uint32),
+        ('f_flags', ctypes.c_uint32),
+        ('f_fssubtype', ctypes.c_uint32),
+        ('f_fstypename', ctypes.c_char * 16),
+        ('f_mntonname', ctypes.c_char * 1024),
+        ('f_mntfromname', ctypes.c_char * 1024),
+        ('f_flags_ext', ctypes.c_uint32),
+        ('f_reserved', ctypes.c_uint32 * 7),
+    ]
+
+
+# getmntinfo flag: report cached stats instead of blocking on each filesystem
+_MNT_NOWAIT = 2
+
+# Filesystem type by st_dev; every path on one device has the same type
+_FS_TYPE_BY_DEVICE: Dict[int, str] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _libc() -> ctypes.CDLL:
+    """Load libSystem"""
+    library = ctypes.util.find_library('System')
+    if library is None:
+        raise OSError("libSystem not found")
+    return ctypes.CDLL(library, use_errno=True)
+
+
+def _inode64(name: str):
+    """Look up the 64-bit inode variant of a libSystem function
+    
+    x86_64 exports it under a $INODE64-suffixed name; arm64 only has the
+    64-bit variant, under the plain name.
+    """
+    libc = _libc()
+    try:
+        return libc[f'{name}$INODE64']
+    except AttributeError:
+        return getattr(libc, name)
+
+
+@functools.lru_cache(maxsize=None)
+def _libc_statfs():
+    """Load libSystem's statfs(2) with the 64-bit inode struct layout"""
+    statfs = _inode64('statfs')
+    statfs.argtypes = [ctypes.c_char_p, ctypes.POINTER(_StatFS)]
+    statfs.restype = ctypes.c_int
+    return statfs
+
+
+@functools.lru_cache(maxsize=None)
+def _libc_setxattr():
+    """Load libSystem's setxattr(2)"""
+    setxattr = _libc().setxattr
+    setxattr.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p,
+                         ctypes.c_size_t, ctypes.c_uint32, ctypes.c_int]
+    setxattr.restype = ctypes.c_int
+    return setxattr
+
+
+def _setxattr(path: str, name: str, value: bytes) -> None:
+    """Set an extended attribute, raising OSError on failure"""
+    if _libc_setxattr()(os.fsencode(path), name.encode(), value, len(value), 0, 0) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno), str(path))
+
+
+@functools.lru_cache(maxsize=None)
+def _libc_listxattr():
+    """Load libSystem's listxattr(2)"""
+    listxattr = _libc().listxattr
+    listxattr.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t, ctypes.c_int]
+    listxattr.restype = ctypes.c_ssize_t
+    return listxattr
+
+
+def _listxattr(path: str) -> List[str]:
+    """List extended attribute names, raising OSError on failure"""
+    listxattr = _libc_listxattr()
+    encoded_path = os.fsencode(path)
+    while True:
+        # Ask for the size first; retry if attributes were added in between
+        size = listxattr(encoded_path, None, 0, 0)
+        if size > 0:
+            buf = ctypes.create_string_buffer(size)
+            size = listxattr(encoded_path, buf, size, 0)
+        if size >= 0:
+            break
+        errno = ctypes.get_errno()
+        if errno != ERANGE:
+            raise OSError(errno, os.strerror(errno), str(path))
+    if size == 0:
+        return []
+    return [os.fsdecode(name) for name in buf.raw[:size].split(b'\0') if name]
+
+
+@functools.lru_cache(maxsize=None)
+def _read_mounts() -> Tuple[Tuple[str, str], ...]:
+    """Read (mount point, filesystem type) pairs with one getmntinfo(3) call"""
+    getmntinfo = _inode64('getmntinfo')
+    getmntinfo.argtypes = [ctypes.POINTER(ctypes.POINTER(_StatFS)), ctypes.c_int]
+    getmntinfo.restype = ctypes.c_int
+    
+    # The buffer is owned by libSystem and reused between calls
+    mounts = ctypes.POINTER(_StatFS)()
+    count = getmntinfo(ctypes.byref(mounts), _MNT_NOWAIT)
+    if count <= 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return tuple(
+        (os.fsdecode(mounts[i].f_mntonname), mounts[i].f_fstypename.decode('ascii'))
+        for i in range(count)
+    )
+
+
+def _attach_ramdisk(size_mb: int = 512) -> Optional[Tuple[str, str]]:
+    """Attach and format an APFS RAM disk; returns (device, mount point) or None"""
+    name = f"vexy_ramdisk_{os.getpid()}"
+    device = None
+    try:
+        # ram:// sizes are in 512-byte sectors
+        result = subprocess.run(['hdiutil', 'attach', '-nomount', f'ram://{size_mb * 2048}'],
+                                capture_output=True, text=True, check=True)
+        device = result.stdout.strip()
+        subprocess.run(['diskutil', 'erasevolume', 'APFS', name, device],
+                       capture_output=True, check=True)
+        return device, f"/Volumes/{name}"
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"Warning: Could not create RAM disk, using the default temp dir: {e}")
+        if device:
+            _detach_ramdisk(device)
+        return None
+
+
+def _detach_ramdisk(device: str) -> None:
+    """Eject a RAM disk created by _attach_ramdisk, discarding its contents"""
+    try:
+        subprocess.run(['hdiutil', 'detach', device, '-force'], capture_output=True)
+    except FileNotFoundError:
+        pass
+
+
+
+# Cached detection results expire after a day even without a reboot
+_DETECTION_CACHE_TTL = 24 * 60 * 60
+
+
+def _boot_time() -> Optional[int]:
+    """Boot time in seconds from sysctl kern.boottime, or None if unavailable"""
+    class Timeval(ctypes.Structure):
+        _fields_ = [('tv_sec', ctypes.c_long), ('tv_usec', ctypes.c_int32)]
+    
+    try:
+        sysctlbyname = _libc().sysctlbyname
+    except (OSError, AttributeError):
+        return None
+    boot_time = Timeval()
+    size = ctypes.c_size_t(ctypes.sizeof(boot_time))
+    if sysctlbyname(b'kern.boottime', ctypes.byref(boot_time), ctypes.byref(size), None, 0) != 0:
+        return None
+    return boot_time.tv_sec
+
+
+def _detection_cache_path() -> Optional[Path]:
+    """Per-boot, per-kernel cache file for detection results"""
+    boot_time = _boot_time()
+    if boot_time is None:
+        return None
+    key = hashlib.sha256(f"{os.uname().release}-{boot_time}".encode()).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"vexy_glob_macos_detect_{key}.json"
+
+
+def _load_detection_cache(cache_path: Path) -> Optional[List[Dict[str, Any]]]:
+    """Return cached detection results if the cache is fresh and well-formed"""
+    try:
+        if time.time() - cache_path.stat().st_mtime >= _DETECTION_CACHE_TTL:
+            return None
+        detected = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(detected, list) or len(detected) != 4:
+        return None
+    return detected
+
+
+def _save_detection_cache(cache_path: Path, detected: List[Dict[str, Any]]) -> None:
+    """Write detection results atomically; failures only cost a re-detect"""
+    try:
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(detected))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
 
 
 class MacOSIntegrationTest(unittest.TestCase):
     """Comprehensive macOS platform integration testing"""
     
+    # Version-specific feature tests by major version
+    _VERSION_FEATURE_TESTS = {
+        '11': '_test_big_sur_features',
+        '12': '_test_monterey_features',
+        '13': '_test_ventura_features',
+        '14': '_test_sonoma_features',
+    }
+    
     @classmethod
     def setUpClass(cls):
         """Detect macOS version and system configuration"""
-        cls.macos_info = cls._detect_macos_version()
-        cls.filesystem_info = cls._detect_filesystems()
-        cls.security_info = cls._detect_security_features()
-        cls.xcode_info = cls._detect_xcode()
+        # Results only change across reboots or OS updates, so reuse a recent
+        # on-disk copy when there is one
+        cache_path = _detection_cache_path()
+        detected = _load_detection_cache(cache_path) if cache_path else None
+        if detected is None:
+            # The detectors are independent and mostly wait on child
+            # processes, so run them concurrently
+            detectors = [_detect_macos_version, _detect_filesystems,
+                         _detect_security_features, _detect_xcode]
+            with ThreadPoolExecutor(max_workers=len(detectors)) as executor:
+                detected = list(executor.map(lambda detect: detect(), detectors))
+            if cache_path:
+                _save_detection_cache(cache_path, detected)
+        
+        (cls.macos_info, cls.filesystem_info,
+         cls.security_info, cls.xcode_info) = detected
         
         print(f"Detected macOS: {cls.macos_info['version']} ({cls.macos_info['name']})")
         print(f"File systems: {', '.join(cls.filesystem_info['available'])}")
         print(f"SIP status: {cls.security_info['sip_status']}")
         print(f"Xcode available: {cls.xcode_info['available']}")
         
+        # Opt-in RAM disk for test roots: fixture writes then skip the SSD.
+        # Off by default since it creates (and later ejects) a volume
+        cls._ramdisk_device, cls._ramdisk = None, None
+        if os.environ.get('VEXY_GLOB_MACOS_RAMDISK'):
+            ramdisk = _attach_ramdisk()
+            if ramdisk:
+                cls._ramdisk_device, cls._ramdisk = ramdisk
+                print(f"Test roots on RAM disk: {cls._ramdisk}")
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Eject the RAM disk, if one was attached"""
+        if cls._ramdisk_device:
+            _detach_ramdisk(cls._ramdisk_device)
+        
     def setUp(self):
         """Set up test environment"""
-        self.test_root = Path(tempfile.mkdtemp(prefix="vexy_glob_macos_test_"))
+        self.test_root = Path(tempfile.mkdtemp(prefix="vexy_glob_macos_test_", dir=self._ramdisk))
+        self._root_str = str(self.test_root)  # For hot loops; skips Path joins
+        self._xattrs_set = False  # Set by tests that add extended attributes
         print(f"Test root: {self.test_root}")
         
     def tearDown(self):
@@ -62,145 +456,20 @@ class MacOSIntegrationTest(unittest.TestCase):
         try:
             if self.test_root.exists():
                 # Remove extended attributes and special files
-                self._clean_extended_attributes(self.test_root)
+                if self._xattrs_set:
+                    self._clean_extended_attributes(self.test_root)
                 shutil.rmtree(self.test_root)
         except Exception as e:
             print(f"Warning: Could not clean up {self.test_root}: {e}")
     
     def _clean_extended_attributes(self, path: Path):
         """Remove extended attributes from test files"""
-        for root, dirs, files in os.walk(path):
-            for name in files + dirs:
-                filepath = Path(root) / name
-                try:
-                    # Remove extended attributes
-                    subprocess.run(['xattr', '-c', str(filepath)], 
-                                 capture_output=True, check=False)
-                except FileNotFoundError:
-                    pass
-    
-    @staticmethod
-    def _detect_macos_version() -> Dict[str, str]:
-        """Detect macOS version and name"""
-        version_info = {'version': 'Unknown', 'name': 'Unknown', 'build': 'Unknown'}
-        
-        try:
-            result = subprocess.run(['sw_vers'], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if line.startswith('ProductVersion:'):
-                        version_info['version'] = line.split('\t')[1].strip()
-                    elif line.startswith('ProductName:'):
-                        version_info['name'] = line.split('\t')[1].strip()
-                    elif line.startswith('BuildVersion:'):
-                        version_info['build'] = line.split('\t')[1].strip()
-        except FileNotFoundError:
-            pass
-        
-        # Map version to marketing name
-        version = version_info['version']
-        if version.startswith('14.'):
-            version_info['marketing_name'] = 'Sonoma'
-        elif version.startswith('13.'):
-            version_info['marketing_name'] = 'Ventura'
-        elif version.startswith('12.'):
-            version_info['marketing_name'] = 'Monterey'
-        elif version.startswith('11.'):
-            version_info['marketing_name'] = 'Big Sur'
-        else:
-            version_info['marketing_name'] = 'Unknown'
-        
-        return version_info
-    
-    @staticmethod
-    def _detect_filesystems() -> Dict[str, List[str]]:
-        """Detect available filesystems"""
-        available = []
-        
-        try:
-            # Check mount points for filesystem types
-            result = subprocess.run(['mount'], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if ' on ' in line and ' (' in line:
-                        fs_info = line.split(' (')[1].split(',')[0]
-                        if fs_info not in available:
-                            available.append(fs_info)
-        except FileNotFoundError:
-            pass
-        
-        # Check for specific filesystem tools
-        fs_tools = {
-            'APFS': ['diskutil', 'apfs', 'list'],
-            'HFS+': ['diskutil', 'info', '/']
-        }
-        
-        for fs_name, cmd in fs_tools.items():
-            try:
-                result = subprocess.run(cmd, capture_output=True, timeout=5)
-                if result.returncode == 0 and fs_name not in available:
-                    available.append(fs_name)
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                pass
-        
-        return {'available': available}
-    
-    @staticmethod
-    def _detect_security_features() -> Dict[str, Any]:
-        """Detect macOS security features"""
-        security_info = {'sip_status': 'unknown', 'gatekeeper': 'unknown'}
-        
-        # Check SIP status
-        try:
-            result = subprocess.run(['csrutil', 'status'], capture_output=True, text=True)
-            if result.returncode == 0:
-                if 'disabled' in result.stdout.lower():
-                    security_info['sip_status'] = 'disabled'
-                elif 'enabled' in result.stdout.lower():
-                    security_info['sip_status'] = 'enabled'
-        except FileNotFoundError:
-            pass
-        
-        # Check Gatekeeper status
         try:
-            result = subprocess.run(['spctl', '--status'], capture_output=True, text=True)
-            if result.returncode == 0:
-                security_info['gatekeeper'] = result.stdout.strip()
-        except FileNotFoundError:
-            pass
-        
-        return security_info
-    
-    @staticmethod
-    def _detect_xcode() -> Dict[str, Any]:
-        """Detect Xcode installation"""
-        xcode_info = {'available': False, 'version': 'Unknown', 'command_line_tools': False}
-        
-        # Check for Xcode
-        try:
-            result = subprocess.run(['xcode-select', '--print-path'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                xcode_info['available'] = True
-                xcode_path = result.stdout.strip()
-                
-                # Check if it's command line tools or full Xcode
-                if 'CommandLineTools' in xcode_path:
-                    xcode_info['command_line_tools'] = True
-                else:
-                    # Try to get Xcode version
-                    try:
-                        result = subprocess.run(['xcodebuild', '-version'], 
-                                              capture_output=True, text=True)
-                        if result.returncode == 0:
-                            version_line = result.stdout.split('\n')[0]
-                            xcode_info['version'] = version_line.split(' ')[1]
-                    except FileNotFoundError:
-                        pass
+            # One recursive xattr run instead of one per file
+            subprocess.run(['xattr', '-cr', str(path)], 
+                         capture_output=True, check=False)
         except FileNotFoundError:
             pass
-        
-        return xcode_info
 
     def test_apfs_filesystem_features(self):
         """Test APFS filesystem features"""
@@ -220,7 +489,19 @@ class MacOSIntegrationTest(unittest.TestCase):
             print(f"  Not on APFS filesystem, skipping APFS-specific tests")
     
     def _get_filesystem_type(self, path: Path) -> str:
-        """Get filesystem type for a path"""
+        """Get filesystem type for a path (statfs(2), cached per device)"""
+        try:
+            device = os.stat(path).st_dev
+            if device not in _FS_TYPE_BY_DEVICE:
+                buf = _StatFS()
+                if _libc_statfs()(os.fsencode(path), ctypes.byref(buf)) != 0:
+                    errno = ctypes.get_errno()
+                    raise OSError(errno, os.strerror(errno), str(path))
+                _FS_TYPE_BY_DEVICE[device] = buf.f_fstypename.decode('ascii')
+            return _FS_TYPE_BY_DEVICE[device]
+        except OSError:
+            pass
+        
         try:
             result = subprocess.run(['stat', '-f', '%T', str(path)], 
                                   capture_output=True, text=True)
@@ -330,45 +611,40 @@ class MacOSIntegrationTest(unittest.TestCase):
         test_files = [
             ("normal_file.txt", None),
             ("file_with_xattr.txt", {"com.apple.metadata:kMDItemComment": "Test comment"}),
-            ("file_with_finder_info.txt", {"com.apple.FinderInfo": b"FINDER_INFO_DATA"}),
+            ("file_with_finder_info.txt", {"com.apple.FinderInfo": b"FINDER_INFO_DATA".ljust(32, b"\0")}),
         ]
         
         created_files = []
         for filename, xattrs in test_files:
-            filepath = self.test_root / filename
-            filepath.write_text(f"Content of {filename}")
+            filepath = os.path.join(self._root_str, filename)
+            write_file((filepath, f"Content of {filename}".encode()))
             created_files.append(filename)
             
             if xattrs:
+                self._xattrs_set = True
                 for attr_name, attr_value in xattrs.items():
                     try:
+                        # os.setxattr is Linux-only, so call setxattr(2) directly;
+                        # string values are stored UTF-8 encoded, as xattr -w does
                         if isinstance(attr_value, str):
-                            # Use xattr command for string values
-                            subprocess.run(['xattr', '-w', attr_name, attr_value, str(filepath)], 
-                                         check=True, capture_output=True)
-                        else:
-                            # Use xattr command for binary values (os.setxattr not available on macOS)
-                            import base64
-                            encoded_value = base64.b64encode(attr_value).decode('ascii')
-                            subprocess.run(['xattr', '-wx', attr_name, encoded_value, str(filepath)], 
-                                         check=True, capture_output=True)
+                            attr_value = attr_value.encode()
+                        _setxattr(filepath, attr_name, attr_value)
                         print(f"    Set extended attribute {attr_name} on {filename}")
-                    except (subprocess.CalledProcessError, FileNotFoundError, OSError) as e:
+                    except OSError as e:
                         print(f"    Warning: Could not set xattr {attr_name} on {filename}: {e}")
         
         # Test that files with extended attributes are found normally
-        results = list(vexy_glob.find("*.txt", root=self.test_root))
+        results = list(vexy_glob.find("*.txt", root=self._root_str))
         self.assertEqual(len(results), len(created_files), "Should find all files regardless of xattrs")
         
         # Test reading extended attributes
         for filename in created_files:
-            filepath = self.test_root / filename
+            filepath = os.path.join(self._root_str, filename)
             try:
-                result = subprocess.run(['xattr', '-l', str(filepath)], 
-                                      capture_output=True, text=True)
-                if result.stdout.strip():
-                    print(f"    {filename} has extended attributes: {len(result.stdout.split())} attrs")
-            except FileNotFoundError:
+                attr_names = _listxattr(filepath)
+                if attr_names:
+                    print(f"    {filename} has extended attributes: {len(attr_names)} attrs")
+            except OSError:
                 pass
 
     def test_resource_forks(self):
@@ -398,7 +674,7 @@ class MacOSIntegrationTest(unittest.TestCase):
         # Test finding files with resource forks
         all_results = list(vexy_glob.find("*", root=self.test_root))
         data_files = list(vexy_glob.find("*", root=self.test_root, 
-                                       exclude=["._*"]))
+                                       exclude=_RESOURCE_FORK_EXCLUDE))
         
         print(f"    Found {len(all_results)} total files")
         print(f"    Found {len(data_files)} files (excluding resource forks)")
@@ -426,7 +702,8 @@ class MacOSIntegrationTest(unittest.TestCase):
         
         # Test Time Machine exclusion attribute
         try:
-            # Set Time Machine exclusion attribute
+            # Set Time Machine exclusion attribute (stored as an xattr)
+            self._xattrs_set = True
             subprocess.run(['tmutil', 'addexclusion', str(self.test_root / "backup_test_0.txt")], 
                          check=True, capture_output=True)
             print("    Set Time Machine exclusion on test file")
@@ -507,14 +784,9 @@ class MacOSIntegrationTest(unittest.TestCase):
         version = self.macos_info['version']
         
         # Test features available in different macOS versions
-        if version.startswith('11.'):  # Big Sur
-            self._test_big_sur_features()
-        elif version.startswith('12.'):  # Monterey
-            self._test_monterey_features()
-        elif version.startswith('13.'):  # Ventura
-            self._test_ventura_features()
-        elif version.startswith('14.'):  # Sonoma
-            self._test_sonoma_features()
+        feature_test = self._VERSION_FEATURE_TESTS.get(version.split('.')[0])
+        if feature_test:
+            getattr(self, feature_test)()
         
         # Test basic functionality works on all supported versions
         test_files = ["version_test.txt", "compatibility.py", "document.md"]
@@ -601,12 +873,15 @@ class MacOSIntegrationTest(unittest.TestCase):
         """Test performance characteristics on macOS"""
         print("🔧 Testing macOS-specific performance...")
         
-        # Create test dataset with macOS-specific files
+        # Create test dataset with macOS-specific files: each folder once,
+        # then files via raw fds from a thread pool (APFS handles concurrent
+        # creates in different files well, and os.write releases the GIL)
         num_files = 1000
+        subdirs = [os.path.join(self._root_str, f"folder_{j}") for j in range((num_files + 99) // 100)]
+        for subdir in subdirs:
+            os.mkdir(subdir)
+        files = []
         for i in range(num_files):
-            subdir = self.test_root / f"folder_{i // 100}"
-            subdir.mkdir(exist_ok=True)
-            
             # Mix of file types common on macOS
             if i % 4 == 0:
                 filename = f"document_{i}.pages"
@@ -617,29 +892,36 @@ class MacOSIntegrationTest(unittest.TestCase):
             else:
                 filename = f"text_{i}.txt"
             
-            (subdir / filename).write_text(f"macOS file {i}")
+            files.append((f"{subdirs[i // 100]}/{filename}", b"macOS file %d" % i))
+        
+        write_files(files)
         
         # Add some .DS_Store files (common on macOS)
-        for i in range(0, num_files, 100):
-            subdir = self.test_root / f"folder_{i // 100}"
-            (subdir / ".DS_Store").write_text("Finder metadata")
+        for subdir in subdirs:
+            write_file((f"{subdir}/.DS_Store", b"Finder metadata"))
         
-        # Measure performance
-        start_time = time.time()
-        all_results = list(vexy_glob.find("*", root=self.test_root))
-        all_time = time.time() - start_time
+        # Measure performance: the first walk pays for any cold vnode and
+        # metadata lookups, the repeat shows steady state
+        start_ns = time.perf_counter_ns()
+        cold_results = list(vexy_glob.find("*", root=self._root_str))
+        cold_time = (time.perf_counter_ns() - start_ns) / 1e9
+        
+        start_ns = time.perf_counter_ns()
+        all_results = list(vexy_glob.find("*", root=self._root_str))
+        all_time = (time.perf_counter_ns() - start_ns) / 1e9
         
-        start_time = time.time()
-        no_hidden_results = list(vexy_glob.find("*", root=self.test_root, hidden=False))
-        no_hidden_time = time.time() - start_time
+        start_ns = time.perf_counter_ns()
+        no_hidden_results = list(vexy_glob.find("*", root=self._root_str, hidden=False))
+        no_hidden_time = (time.perf_counter_ns() - start_ns) / 1e9
         
         print(f"    Created {num_files} files + metadata")
-        print(f"    All files: {len(all_results)} found in {all_time:.3f}s")
+        print(f"    All files (cold): {len(cold_results)} found in {cold_time:.3f}s")
+        print(f"    All files (warm): {len(all_results)} found in {all_time:.3f}s")
         print(f"    No hidden: {len(no_hidden_results)} found in {no_hidden_time:.3f}s")
-        print(f"    Performance: {len(all_results)/all_time:.0f} files/second")
+        print(f"    Performance: {len(all_results) / max(all_time, 1e-9):.0f} files/second (warm)")
         
-        # Performance should be reasonable on macOS
-        self.assertLess(all_time, 10.0, "Search should complete within 10 seconds on macOS")
+        # Performance should be reasonable on macOS, even on the first walk
+        self.assertLess(cold_time, 10.0, "Search should complete within 10 seconds on macOS")
 
 
 def run_macos_integration_tests():
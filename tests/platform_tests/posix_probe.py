@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# this_file: tests/platform_tests/posix_probe.py
+"""
+Tool probing shared by the POSIX platform test scripts
+
+linux_distro_test.py and macos_integration_test.py detect their environment
+partly by running command-line tools and checking only the exit status. The
+detectors in those scripts are memoized per process with functools.lru_cache,
+so every test class shares one probe of the system.
+"""
+
+import functools
+import os
+import shutil
+import signal
+import time
+from typing import List
+
+
+@functools.lru_cache(maxsize=None)
+def devnull() -> int:
+    """Open /dev/null once; probe children get it as stdin/stdout/stderr"""
+    return os.open(os.devnull, os.O_RDWR)
+
+
+def probe(argv: List[str], timeout: float = 5.0) -> bool:
+    """Run a tool with its output discarded; True if it exits 0 within timeout
+    
+    Tools missing from PATH are skipped without forking. posix_spawn avoids
+    subprocess's pipes and reader threads, which a pass/fail probe never uses.
+    """
+    executable = shutil.which(argv[0])
+    if executable is None:
+        return False
+    
+    null_fd = devnull()
+    try:
+        pid = os.posix_spawn(executable, argv, os.environ, file_actions=[
+            (os.POSIX_SPAWN_DUP2, null_fd, 0),
+            (os.POSIX_SPAWN_DUP2, null_fd, 1),
+            (os.POSIX_SPAWN_DUP2, null_fd, 2),
+        ])
+    except OSError:
+        return False
+    
+    deadline = time.monotonic() + timeout
+    while True:
+        waited, status = os.waitpid(pid, os.WNOHANG)
+        if waited:
+            return os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        if time.monotonic() >= deadline:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            return False
+        time.sleep(0.01)